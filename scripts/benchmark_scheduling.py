@@ -10,7 +10,7 @@ Notes:
 """
 
 from __future__ import annotations
-import argparse, random, statistics, json, time, os, sys
+import argparse, random, statistics, json, os, sys
 from typing import List
 
 # Ensure project root on path
@@ -19,7 +19,7 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 from src.core.models import Section, TrainRequest, NetworkModel  # type: ignore
-from src.core.solver import schedule_trains  # type: ignore
+from src.core.solver import time_schedule  # type: ignore
 
 
 def build_random_network(num_sections: int) -> NetworkModel:
@@ -49,17 +49,12 @@ def build_random_trains(n: int, network: NetworkModel, avg_route_len: int) -> Li
 
 def run_once(n_trains: int, network: NetworkModel, avg_route_len: int, solver: str) -> dict:
     trains = build_random_trains(n_trains, network, avg_route_len)
-    t0 = time.perf_counter()
-    schedule = schedule_trains(trains, network, solver=solver)
-    dt = time.perf_counter() - t0
-    horizon = max((it.exit for it in schedule), default=0)
+    timing = time_schedule(trains, network, solver)
     return {
         "n_trains": n_trains,
         "solver": solver,
         "routes_mean_len": statistics.fmean(len(t.route_sections) for t in trains) if trains else 0.0,
-        "elapsed_s": dt,
-        "items": len(schedule),
-        "horizon_s": horizon,
+        **timing,
     }
 
 
@@ -1,3 +1,4 @@
+from bisect import insort_right
 from typing import List, Dict
 from .models import TrainRequest, NetworkModel, ScheduleItem
 
@@ -9,6 +10,8 @@ from .models import TrainRequest, NetworkModel, ScheduleItem
 def schedule_trains(trains: List[TrainRequest], network: NetworkModel) -> List[ScheduleItem]:
     # occupancy[section_id] = list of (entry, exit) intervals sorted by entry
     occupancy: Dict[str, List[ScheduleItem]] = {s.id: [] for s in network.sections}
+    # id -> Section index so each leg is an O(1) lookup rather than a scan of network.sections
+    sections = {s.id: s for s in network.sections}
     result: List[ScheduleItem] = []
 
     # sort trains by priority desc, then planned departure asc
@@ -18,7 +21,7 @@ def schedule_trains(trains: List[TrainRequest], network: NetworkModel) -> List[S
         current_time = t.planned_departure
         prev_exit = current_time
         for idx, sid in enumerate(t.route_sections):
-            sec = network.section_by_id(sid)
+            sec = sections[sid]
             headway = sec.headway_seconds
             traverse = sec.traverse_seconds
 
@@ -43,12 +46,10 @@ def schedule_trains(trains: List[TrainRequest], network: NetworkModel) -> List[S
 
 
 def _find_earliest(start: int, headway: int, traverse: int, occ: List[ScheduleItem], blocks: List[tuple]) -> int:
-    # Occ intervals are non-overlapping and sorted; find earliest entry >= start such that
+    # Occ intervals are sorted by entry; find earliest entry >= start such that
     # [entry, entry+traverse) doesn't violate headway with neighbors.
     entry = start
-    i = 0
     while True:
-        i = 0
         # First, ensure we don't overlap any block windows [b0,b1)
         moved_for_block = False
         for (b0, b1) in blocks:
@@ -58,24 +59,22 @@ def _find_earliest(start: int, headway: int, traverse: int, occ: List[ScheduleIt
         if moved_for_block:
             continue  # re-check blocks and occupancy after jumping
 
-        while i < len(occ):
-            cur = occ[i]
-            # enforce separation from previous interval
-            earliest_after_prev = cur.exit + headway
-            # If proposed interval overlaps with current occupancy or violates headway, push after
-            if not (entry + traverse + headway <= cur.entry or entry >= earliest_after_prev):
-                entry = max(earliest_after_prev, cur.exit + headway)
-                i = 0  # restart scan since entry changed
-                continue
-            i += 1
+        # Single forward pass: every interval before a conflict is already cleared by
+        # entry >= exit + headway, and entry only moves later, so a rescan from the start is never needed.
+        for cur in occ:
+            if entry + traverse + headway <= cur.entry:
+                break  # this and all later intervals start after the proposed one (occ sorted by entry)
+            if entry < cur.exit + headway:
+                entry = cur.exit + headway
         # Passed occupancy and block checks
         break
     return entry
 
 
 def _insert_occupancy(occ: List[ScheduleItem], item: ScheduleItem) -> None:
-    # insert maintaining sort by entry
-    idx = 0
-    while idx < len(occ) and occ[idx].entry <= item.entry:
-        idx += 1
-    occ.insert(idx, item)
+    # insert maintaining sort by entry (after any equal entries), via binary search
+    insort_right(occ, item, key=_entry_key)
+
+
+def _entry_key(item: ScheduleItem) -> int:
+    return item.entry
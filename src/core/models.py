@@ -3,7 +3,7 @@ from typing import List, Optional, Tuple, Dict
 
 Seconds = int
 
-@dataclass
+@dataclass(slots=True)
 class Section:
     id: str
     headway_seconds: Seconds  # minimum separation between consecutive trains
@@ -19,7 +19,7 @@ class Section:
     # Any two legs assigned to the same group must be separated by the group's clearance time.
     conflict_groups: Optional[Dict[str, Seconds]] = None
 
-@dataclass
+@dataclass(slots=True)
 class TrainRequest:
     id: str
     priority: int  # higher = more important
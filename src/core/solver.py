@@ -1,3 +1,4 @@
+import time
 from typing import List
 
 from src.core.models import TrainRequest, NetworkModel, ScheduleItem
@@ -13,3 +14,18 @@ def schedule_trains(trains: List[TrainRequest], network: NetworkModel, solver: s
             # Fallback to greedy if MILP unsupported scenario or times out
             return greedy_schedule(trains, network)
     return greedy_schedule(trains, network)
+
+
+def time_schedule(trains: List[TrainRequest], network: NetworkModel, solver: str = "greedy") -> dict:
+    """Schedule one instance, timing only the solver call.
+
+    Kept at module level so it can be submitted to a ProcessPoolExecutor.
+    """
+    t0 = time.perf_counter()
+    schedule = schedule_trains(trains, network, solver=solver)
+    dt = time.perf_counter() - t0
+    return {
+        "elapsed_s": dt,
+        "items": len(schedule),
+        "horizon_s": max((it.exit for it in schedule), default=0),
+    }
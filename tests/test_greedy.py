@@ -1,8 +1,8 @@
 import json
 from pathlib import Path
 
-from src.core.models import NetworkModel, Section, TrainRequest
-from src.core.greedy_scheduler import schedule_trains
+from src.core.models import NetworkModel, ScheduleItem, Section, TrainRequest
+from src.core.greedy_scheduler import _insert_occupancy, schedule_trains
 
 DATA_DIR = Path(__file__).parents[1] / "src" / "data"
 
@@ -54,3 +54,42 @@ def test_headway_enforced_and_priority_affects_order():
     # Ensure that if T2 is first, that reflects higher priority impact under congestion
     # Note: Greedy sorts by priority desc then departure asc
     assert first.train_id == "T2"
+
+
+def test_train_fills_gap_between_existing_intervals():
+    sections = [Section(id="S1", headway_seconds=10, traverse_seconds=50)]
+    network = NetworkModel(sections=sections)
+    trains = [
+        TrainRequest(id="A", priority=3, planned_departure=0, route_sections=["S1"]),
+        TrainRequest(id="B", priority=2, planned_departure=200, route_sections=["S1"]),
+        # Fits untouched in the gap between A and B
+        TrainRequest(id="C", priority=1, planned_departure=70, route_sections=["S1"]),
+        # Pushed behind C by headway, but still fits before B
+        TrainRequest(id="D", priority=0, planned_departure=100, route_sections=["S1"]),
+    ]
+
+    entries = {it.train_id: (it.entry, it.exit) for it in schedule_trains(trains, network)}
+
+    assert entries == {"A": (0, 50), "B": (200, 250), "C": (70, 120), "D": (130, 180)}
+
+
+def test_occupancy_insert_keeps_equal_entries_in_arrival_order():
+
+    occ = [ScheduleItem("a", "S1", 0, 10), ScheduleItem("b", "S1", 20, 30)]
+    _insert_occupancy(occ, ScheduleItem("c", "S1", 20, 25))
+    _insert_occupancy(occ, ScheduleItem("d", "S1", 0, 5))
+    _insert_occupancy(occ, ScheduleItem("e", "S1", 15, 18))
+
+    assert [it.train_id for it in occ] == ["a", "d", "e", "b", "c"]
+
+
+def test_block_windows_push_entry_past_each_block():
+    sections = [Section(id="S1", headway_seconds=0, traverse_seconds=100, block_windows=[(50, 120), (130, 250)])]
+    network = NetworkModel(sections=sections)
+    t1 = TrainRequest(id="T1", priority=2, planned_departure=0, route_sections=["S1"])
+    t2 = TrainRequest(id="T2", priority=1, planned_departure=0, route_sections=["S1"])
+
+    entries = {it.train_id: (it.entry, it.exit) for it in schedule_trains([t1, t2], network)}
+
+    # T1 jumps past the first block, then the second; T2 then queues behind T1
+    assert entries == {"T1": (250, 350), "T2": (350, 450)}
@@ -4,21 +4,32 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 import os
 import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
 from typing import Any, Dict, List, Optional
 
 
+# Upper bound on keep-alive connections per host; the client is shared by every page and session
+POOL_SIZE = 16
+
+
 class ApiClient:
     def __init__(self, base_url: Optional[str] = None, timeout: float = 120.0) -> None:
         self.base_url = base_url or os.environ.get("API_BASE", "http://localhost:8000")
         self.timeout = timeout
+        # Shared keep-alive session; also used directly by pages for ad-hoc endpoints
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def _post(self, path: str, json: Dict[str, Any] | None = None, params: Dict[str, Any] | None = None) -> Dict[str, Any]:
-        r = requests.post(f"{self.base_url}{path}", json=json, params=params, timeout=self.timeout)
+        r = self.session.post(f"{self.base_url}{path}", json=json, params=params, timeout=self.timeout)
         r.raise_for_status()
         return r.json()
 
     def _get(self, path: str, params: Dict[str, Any] | None = None) -> Dict[str, Any]:
-        r = requests.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        r = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
         r.raise_for_status()
         return r.json()
 
@@ -72,11 +83,17 @@ class ApiClient:
         return self._get(f"/runs/{rid}")
 
     def delete_run(self, rid: int) -> Dict[str, Any]:
-        r = requests.delete(f"{self.base_url}/runs/{rid}", timeout=self.timeout)
+        r = self.session.delete(f"{self.base_url}/runs/{rid}", timeout=self.timeout)
         r.raise_for_status()
         return r.json()
 
     def delete_scenario(self, sid: int) -> Dict[str, Any]:
-        r = requests.delete(f"{self.base_url}/scenarios/{sid}", timeout=self.timeout)
+        r = self.session.delete(f"{self.base_url}/scenarios/{sid}", timeout=self.timeout)
         r.raise_for_status()
         return r.json()
+
+
+@st.cache_resource(show_spinner=False)
+def get_api() -> ApiClient:
+    """Process-wide ApiClient, so all pages and reruns share one pooled session."""
+    return ApiClient()
@@ -5,6 +5,34 @@ if ROOT not in sys.path:
 from typing import Any, Dict, List
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+
+# Above this many bars, render WebGL line segments instead of SVG timeline bars
+GL_BAR_THRESHOLD = 1000
+
+
+def _render_gantt_gl(df: pd.DataFrame) -> go.Figure:
+    """One Scattergl trace per section; each bar is a None-separated [start, end] segment on its train row."""
+    fig = go.Figure()
+    for section, g in df.groupby("section", sort=False):
+        x: List[Any] = []
+        y: List[Any] = []
+        text: List[Any] = []
+        for train, start, end, late in zip(g["train"], g["start"], g["end"], g["lateness_s"]):
+            hover = f"Train={train}<br>Section={section}<br>Start={start}<br>End={end}<br>Lateness(s)={late}"
+            x += [start, end, None]
+            y += [train, train, None]
+            text += [hover, hover, None]
+        fig.add_trace(go.Scattergl(
+            x=x, y=y, mode="lines",
+            line=dict(width=10),
+            name=str(section),
+            text=text,
+            hovertemplate="%{text}<extra></extra>",
+        ))
+    fig.update_yaxes(type="category", autorange="reversed")
+    fig.update_xaxes(type="linear", title="Time (s)")
+    return fig
 
 
 def render_gantt(gantt: List[Dict[str, Any]], lateness_map: Dict[str, int] | None = None, last_section_map: Dict[str, str] | None = None):
@@ -20,15 +48,22 @@ def render_gantt(gantt: List[Dict[str, Any]], lateness_map: Dict[str, int] | Non
         return None
 
     df["lateness_s"] = df.apply(compute_lateness, axis=1)
-    fig = px.timeline(
+    if len(df) > GL_BAR_THRESHOLD:
+        return _render_gantt_gl(df)
+    # Horizontal bars on a numeric seconds axis, matching the GL path (px.timeline would put the integer
+    # times on a date axis).
+    df["duration"] = df["end"] - df["start"]
+    fig = px.bar(
         df,
-        x_start="start",
-        x_end="end",
+        base="start",
+        x="duration",
         y="train",
         color="section",
-        hover_data=["lateness_s"],
-        custom_data=["section", "lateness_s"],
+        orientation="h",
+        custom_data=["section", "lateness_s", "start", "end"],
     )
-    fig.update_yaxes(autorange="reversed")
-    fig.update_traces(hovertemplate="Train=%{y}<br>Section=%{customdata[0]}<br>Start=%{x}<br>End=%{x_end}<br>Lateness(s)=%{customdata[1]}")
+    fig.update_layout(barmode="overlay")
+    fig.update_yaxes(type="category", autorange="reversed")
+    fig.update_xaxes(type="linear", title="Time (s)")
+    fig.update_traces(hovertemplate="Train=%{y}<br>Section=%{customdata[0]}<br>Start=%{customdata[2]}<br>End=%{customdata[3]}<br>Lateness(s)=%{customdata[1]}<extra></extra>")
     return fig
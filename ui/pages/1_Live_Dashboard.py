@@ -4,12 +4,13 @@ ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.par
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-from ui.api_client import ApiClient
+from ui.api_client import get_api
 from ui.state_manager import ensure_defaults, get_state_payload, set_state_payload, add_hold_action, clear_pending_holds
 from ui.components.gantt_chart import render_gantt
 from ui.components.kpi_display import render_kpis
 from ui.components.time_distance import render_time_distance
-from ui.components.track_schematic import render_track_schematic
+from ui.components.track_schematic import FREE_LABEL, render_track_schematic
+import orjson
 import pandas as pd
 import plotly.express as px
 import time
@@ -18,7 +19,27 @@ import time
 # NOTE: Page config should be set once in ui/app.py for multipage apps.
 # Do NOT call st.set_page_config() here to avoid Streamlit warnings.
 ensure_defaults()
-api = ApiClient()
+
+api = get_api()
+
+# Above this many schedule segments, Gantt/Time-Distance plot only the longest-running trains
+PLOT_SEGMENT_LIMIT = 5000
+
+
+def _decimate_schedule(items, keep_trains: int):
+    """Keep only the `keep_trains` trains with the largest total route time.
+    Returns (filtered items, set of kept train ids).
+    """
+    totals = {}
+    for it in items:
+        start, end = it.get("entry"), it.get("exit")
+        if start is None or end is None:
+            continue
+        tid = it.get("train_id")
+        totals[tid] = totals.get(tid, 0) + (end - start)
+    keep = set(sorted(totals, key=totals.get, reverse=True)[:keep_trains])
+    return [it for it in items if it.get("train_id") in keep], keep
+
 
 st.title("Live Dashboard")
 
@@ -109,8 +130,12 @@ if conflicts:
                                 "solver": solver,
                                 "otp_tolerance": int(otp_tolerance),
                             }
-                            import requests, json as _json
-                            r = requests.post(f"{api.base_url}/adjust", json=adj_body, timeout=api.timeout)
+                            r = api.session.post(
+                                f"{api.base_url}/adjust",
+                                data=orjson.dumps(adj_body),
+                                headers={"Content-Type": "application/json"},
+                                timeout=api.timeout,
+                            )
                             r.raise_for_status()
                             adj = r.json()
                             k = adj.get("kpis", {})
@@ -143,10 +168,16 @@ else:
 # Render a Schedule Gantt if we have items (from resolve or direct schedule)
 st.markdown("---")
 st.subheader("Schedule Gantt")
+plot_items, plot_trains = schedule_items, None
+if len(schedule_items) > PLOT_SEGMENT_LIMIT:
+    show_all_segments = st.checkbox("Show all segments (slow)", value=False, help=f"Schedules above {PLOT_SEGMENT_LIMIT} segments are reduced to the Max Trains longest-running trains for plotting.")
+    if not show_all_segments:
+        plot_items, plot_trains = _decimate_schedule(schedule_items, int(max_trains))
+        st.caption(f"Plotting {len(plot_trains)} longest-running trains ({len(plot_items)} of {len(schedule_items)} segments).")
 try:
-    if schedule_items:
+    if plot_items:
         gantt_rows = []
-        for it in schedule_items:
+        for it in plot_items:
             start = it.get("entry")
             end = it.get("exit")
             if start is None or end is None:
@@ -172,12 +203,15 @@ st.markdown("---")
 st.subheader("Predictive Time-Distance")
 try:
     # Reuse existing schedule if available, else fetch
-    items = schedule_items
+    items = plot_items
     if not items:
         sched = api.schedule(state, solver=solver)
         items = sched.get("schedule", [])
     if items:
-        st.plotly_chart(render_time_distance(state, items, conflicts), use_container_width=True)
+        td_state = state
+        if plot_trains is not None:
+            td_state = {**state, "trains": [t for t in state.get("trains", []) if t.get("id") in plot_trains]}
+        st.plotly_chart(render_time_distance(td_state, items, conflicts), use_container_width=True)
     else:
         st.caption("No schedule available for predictive overlay.")
 except Exception as e:
@@ -231,7 +265,9 @@ try:
                 labels={"progress": "Section Progress (0=start, 1=end)"},
                 title="Current Train Positions by Section"
             )
-            st.plotly_chart(figm, use_container_width=True)
+            # Stable uirevision lets Plotly update the existing plot instead of redrawing it
+            figm.update_layout(uirevision="live_movement")
+            st.plotly_chart(figm, use_container_width=True, config={"responsive": False})
         else:
             st.caption("No trains currently traversing a section at this moment.")
     else:
@@ -244,9 +280,11 @@ try:
     items = schedule_items or (api.schedule(state, solver=solver).get("schedule", []))
     if items:
         # Reuse the same 'now' as above if available, else default to current time
-        now_val = 'now' in locals() and now or time.time()
-        figt = render_track_schematic(state, items, now_val)
-        st.plotly_chart(figt, use_container_width=True)
+        now_val = now if 'now' in locals() else time.time()
+        schematic = render_track_schematic(state, items, now_val)
+        occupied = int((schematic.data["Occupied By"] != FREE_LABEL).sum())
+        st.caption(f"{occupied}/{len(schematic.data)} sections occupied")
+        st.dataframe(schematic, use_container_width=True, hide_index=True)
     else:
         st.caption("No schedule to render schematic.")
 except Exception as e:
@@ -1,15 +1,24 @@
 import io
-import csv
 import time
-import json as _json
+from collections import deque
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import plotly.express as px
 import streamlit as st
 import os, sys
+try:
+    import fcntl  # POSIX only; history file locking is skipped elsewhere
+except ImportError:
+    fcntl = None
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-from ui.api_client import ApiClient
-from ui.state_manager import ensure_defaults, get_state_payload, set_state_payload, default_payload
+from ui.api_client import get_api
+from ui.state_manager import ensure_defaults, get_state_payload, set_state_payload, default_payload, get_payload_key, get_sanitized_trains
 from ui.components.gantt_chart import render_gantt
 from ui.components.scenario_editor import editor
 from ui.components.kpi_display import render_kpis
@@ -17,7 +26,135 @@ from ui.components.kpi_display import render_kpis
 
 st.set_page_config(page_title="Scenario Analysis", layout="wide")
 ensure_defaults()
-api = ApiClient()
+
+api = get_api()
+
+
+# Persisted-scenario reads, cached briefly so widget reruns don't re-fetch; keyed on base_url
+# so pointing API_BASE elsewhere misses. Mutations below clear the affected caches.
+@st.cache_data(ttl=30, show_spinner=False)
+def _list_scenarios(base_url: str) -> list:
+    return get_api().get_scenarios().get("items", [])
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _list_runs(base_url: str, sid: int) -> list:
+    return get_api().list_runs(sid).get("items", [])
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_run(base_url: str, rid: int) -> dict:
+    return get_api().get_run(rid).get("run", {})
+
+
+# Row cap for the what-if schedule table; larger schedules are still plotted in full
+SCHEDULE_TABLE_ROWS = 500
+# Benchmark runs kept in session memory (and so max points per model in the history plot);
+# older runs survive only in the persist file
+HISTORY_MAX_ENTRIES = 200
+
+
+def _delay_minutes(value) -> float:
+    """current_delay_minutes as float; NaN when the edited JSON holds something non-numeric."""
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _index_trains():
+    """One walk over the sanitized trains per payload version, shared by the Gantt and benchmark panels.
+    Returns (truth_map, tids, truth_vec, present_mask, last_section_map); the arrays are aligned to truth_map order.
+    Held in session_state (not st.cache_data, which returns a fresh copy per hit) until the payload changes.
+    """
+    payload_key = get_payload_key()
+    if st.session_state.get("train_index_key") != payload_key:
+        truth_map = {}
+        present_set = set()
+        last_section_map = {}
+        for tr in get_sanitized_trains():
+            tid = tr.get("id")
+            if tr.get("route_sections"):
+                last_section_map[tid] = tr["route_sections"][-1]
+            if not isinstance(tid, str):
+                continue
+            # Proxy truth per id, plus the ids that actually carry current_delay_minutes
+            if "current_delay_minutes" in tr:
+                present_set.add(tid)
+            truth_map[tid] = _delay_minutes(tr.get("current_delay_minutes", 0.0))
+        tids = np.array(list(truth_map), dtype=object)
+        truth_vec = np.fromiter(truth_map.values(), dtype=np.float64, count=len(truth_map))
+        present_mask = np.fromiter((tid in present_set for tid in truth_map), dtype=bool, count=len(truth_map))
+        st.session_state.train_index = (truth_map, tids, truth_vec, present_mask, last_section_map)
+        st.session_state.train_index_key = payload_key
+    return st.session_state.train_index
+
+
+def _records_frame(records: list) -> pd.DataFrame:
+    """List of row dicts -> Arrow-backed DataFrame (columnar conversion done by Arrow in C)."""
+    # from_pylist takes its columns from the first row; if rows differ in keys, let pandas take the union
+    keys = records[0].keys() if records else None
+    if any(r.keys() != keys for r in records):
+        return pd.DataFrame(records)
+    try:
+        return pa.Table.from_pylist(records).to_pandas(types_mapper=pd.ArrowDtype)
+    except (pa.ArrowException, TypeError):
+        # Mixed-type columns Arrow can't infer; fall back to pandas' record inference
+        return pd.DataFrame(records)
+
+
+def _lock(f, exclusive: bool = False) -> None:
+    """Advisory flock held until ``f`` is closed; no-op where fcntl is unavailable."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+
+def _replace_history_file(path: str, data: bytes) -> None:
+    """Write ``data`` to a sibling temp file and atomically swap it in, so readers never see a torn file."""
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _migrate_history_file(path: str) -> None:
+    """Rewrite a legacy JSON-array history file as newline-delimited JSON (one entry per line)."""
+    with open(path, 'rb') as f:
+        _lock(f)
+        if not f.read(64).lstrip().startswith(b'['):
+            return
+        f.seek(0)
+        entries = orjson.loads(f.read()) or []
+    _replace_history_file(path, b''.join(orjson.dumps(e) + b'\n' for e in entries))
+
+
+def _append_history(path: str, entry: dict) -> None:
+    if os.path.exists(path):
+        _migrate_history_file(path)
+    with open(path, 'ab') as f:
+        _lock(f, exclusive=True)
+        f.write(orjson.dumps(entry) + b'\n')
+
+
+def _bump_history_rev() -> None:
+    st.session_state.benchmark_history_rev = st.session_state.get("benchmark_history_rev", 0) + 1
+
+
+def _history_frame() -> pd.DataFrame:
+    """Flattened benchmark history for the MAE plot.
+    Held in session_state and rebuilt only when a run is added or the history is cleared.
+    """
+    rev = st.session_state.get("benchmark_history_rev", 0)
+    if st.session_state.get("history_frame_rev") != rev:
+        # Flatten per-model metrics for plotting
+        rows = [{"ts": entry.get("ts"), **m} for entry in st.session_state.benchmark_history for m in entry.get("metrics", [])]
+        dfh = pd.DataFrame(rows)
+        if not dfh.empty:
+            dfh = dfh.sort_values("ts", kind="stable")
+        st.session_state.history_frame = dfh
+        st.session_state.history_frame_rev = rev
+    return st.session_state.history_frame
+
 
 st.title("Scenario Analysis")
 
@@ -27,8 +164,7 @@ with util_cols[0]:
     up_file = st.file_uploader("Load Scenario JSON", type=["json"], help="Upload a scenario file generated externally or via the generator below.")
     if up_file is not None:
         try:
-            import json as _jsonu
-            data = _jsonu.loads(up_file.read())
+            data = orjson.loads(up_file.read())
             if isinstance(data, dict) and data.get("sections") and data.get("trains"):
                 set_state_payload(data)
                 st.success(f"Loaded scenario: {len(data['sections'])} sections, {len(data['trains'])} trains.")
@@ -51,46 +187,56 @@ with util_cols[2]:
         g_due = st.toggle("Include Due Times", value=True, help="Assign due_time to ~50% of trains")
         gen_btn = st.button("Generate Scenario", key="gen_large_scenario")
         if gen_btn:
-            import random, math
-            random.seed(int(g_seed))
-            sections = []
-            for i in range(int(g_sec)):
-                sections.append({
-                    "id": f"S{i+1}",
-                    "headway_seconds": random.randint(60, 240),
-                    "traverse_seconds": random.randint(90, 300),
-                    "block_windows": []
-                })
+            rng = np.random.default_rng(int(g_seed))
+            n_sec, n_tr = int(g_sec), int(g_tr)
+            # Draw every random field in bulk, then assemble the dicts in one pass
+            headways = rng.integers(60, 241, size=n_sec)
+            traverses = rng.integers(90, 301, size=n_sec)
+            sections = [
+                {"id": f"S{i+1}", "headway_seconds": h, "traverse_seconds": tv, "block_windows": []}
+                for i, (h, tv) in enumerate(zip(headways.tolist(), traverses.tolist()))
+            ]
             sec_ids = [s['id'] for s in sections]
+            base_deps = np.arange(n_tr) * 30 + rng.integers(0, int(g_stagger) + 1, size=n_tr)
+            priorities = rng.integers(1, 4, size=n_tr)
+            if g_route >= len(sec_ids):
+                lengths = np.full(n_tr, len(sec_ids))
+                starts = np.zeros(n_tr, dtype=np.int64)
+            else:
+                lengths = np.clip(rng.normal(g_route, 1, n_tr).astype(np.int64), 1, len(sec_ids))
+                starts = rng.integers(0, len(sec_ids) - lengths + 1)
+            # Due time = departure + per-section traverse estimate (masked to each route's length) + jitter
+            has_due = (rng.random(n_tr) < 0.5) & bool(g_due)
+            dues = np.zeros(n_tr, dtype=np.int64)
+            due_idx = np.flatnonzero(has_due)
+            if due_idx.size:
+                max_len = int(lengths[due_idx].max())
+                trav_est = rng.integers(90, 241, size=(due_idx.size, max_len))
+                trav_est[np.arange(max_len) >= lengths[due_idx, None]] = 0
+                dues[due_idx] = base_deps[due_idx] + trav_est.sum(axis=1) + rng.integers(-120, 181, size=due_idx.size)
             trains = []
-            for t in range(int(g_tr)):
-                base_dep = t * 30 + random.randint(0, int(g_stagger))
-                if g_route >= len(sec_ids):
-                    route = sec_ids[:]
-                else:
-                    length = max(1, min(len(sec_ids), int(random.gauss(g_route, 1))))
-                    start = random.randint(0, max(0, len(sec_ids) - length))
-                    route = sec_ids[start:start+length]
+            for t, (dep, prio, s0, ln, due_flag, due) in enumerate(zip(
+                base_deps.tolist(), priorities.tolist(), starts.tolist(), lengths.tolist(), has_due.tolist(), dues.tolist()
+            )):
                 tr = {
                     "id": f"T{t+1}",
-                    "priority": random.randint(1,3),
-                    "planned_departure": base_dep,
-                    "route_sections": route
+                    "priority": prio,
+                    "planned_departure": dep,
+                    "route_sections": sec_ids[s0:s0+ln]
                 }
-                if g_due and random.random() < 0.5:
-                    est = base_dep + sum(random.randint(90, 240) for _ in route)
-                    tr["due_time"] = est + random.randint(-120, 180)
+                if due_flag:
+                    tr["due_time"] = due
                 trains.append(tr)
             payload_gen = {"sections": sections, "trains": trains}
             set_state_payload(payload_gen)
             st.success(f"Generated scenario with {len(sections)} sections & {len(trains)} trains.")
         # Download current generated scenario if available
-        if st.session_state.get('payload') and isinstance(st.session_state.payload, dict):
-            import json as _jsond
+        cur_payload = get_state_payload()
+        if cur_payload and isinstance(cur_payload, dict):
             st.download_button(
                 "Download Current Scenario JSON",
-                data=_jsond.dumps(st.session_state.payload, indent=2),
-                file_name=f"scenario_{len(st.session_state.payload.get('trains', []))}x{len(st.session_state.payload.get('sections', []))}.json",
+                data=orjson.dumps(cur_payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2),
+                file_name=f"scenario_{len(cur_payload.get('trains', []))}x{len(cur_payload.get('sections', []))}.json",
                 mime="application/json"
             )
 with util_cols[3]:
@@ -161,10 +307,7 @@ if st.session_state.last_whatif:
     result = st.session_state.last_whatif
     gantt = result.get("gantt", [])
     lateness_map = result.get("lateness_by_train", {})
-    last_section_map = {}
-    for tr in payload.get("trains", []):
-        if isinstance(tr, dict) and tr.get("route_sections"):
-            last_section_map[tr.get("id")] = tr["route_sections"][-1]
+    last_section_map = _index_trains()[4]
     st.subheader("Latest What-If Schedule")
     if gantt:
         # Apply plot filters
@@ -175,24 +318,23 @@ if st.session_state.last_whatif:
             gantt_f = [g for g in gantt if str(g.get("train", "")).startswith(pref)]
         else:
             gantt_f = gantt
-        # Cap number of trains by first-seen ordering
-        seen = []
+        # Cap number of trains by first-seen ordering, counting all trains in the same pass
         allowed_trains = set()
+        all_trains = set()
         for g in gantt_f:
             tid = g.get("train")
-            if tid not in allowed_trains:
-                seen.append(tid)
-                allowed_trains.add(tid)
-            if len(seen) >= max_tr:
-                break
-        if len(allowed_trains) < len({g.get('train') for g in gantt_f}):
+            if tid not in all_trains:
+                all_trains.add(tid)
+                if len(allowed_trains) < max_tr:
+                    allowed_trains.add(tid)
+        if len(allowed_trains) < len(all_trains):
             st.caption(f"Showing first {len(allowed_trains)} trains (filtered by prefix/pagination).")
-        gantt_f = [g for g in gantt_f if g.get("train") in allowed_trains]
+            gantt_f = [g for g in gantt_f if g.get("train") in allowed_trains]
         fig = render_gantt(gantt_f, lateness_map, last_section_map)
         # Detect zero visible bars (all zero-duration) -> Plotly may not show them clearly
-        zero_durations = sum(1 for g in gantt if (g.get("end") == g.get("start")))
-        st.plotly_chart(fig, use_container_width=True)
-        if zero_durations == len(gantt):
+        all_zero = not any(g.get("end") != g.get("start") for g in gantt)
+        st.plotly_chart(fig, use_container_width=True, config={"plotGlPixelRatio": 2})
+        if all_zero:
             st.info("All schedule intervals have zero duration (start == end); bars may appear invisible. Consider verifying traverse/headway data.")
     else:
         reason = result.get("reason") or "No schedule returned in last what-if result."
@@ -204,16 +346,16 @@ if st.session_state.last_whatif:
             f_sched = fallback.get("schedule", [])
             if f_sched:
                 st.caption("Fallback full schedule (from /schedule):")
-                import pandas as _pd
-                st.dataframe(_pd.DataFrame(f_sched))
+                st.dataframe(_records_frame(f_sched))
         except Exception as _e:
             st.info(f"Fallback schedule failed: {_e}")
     # Show tabular schedule from what-if if present
     sched_items = result.get("schedule") or []
     if sched_items:
-        import pandas as _pd
         st.caption("What-If Schedule Items")
-        st.dataframe(_pd.DataFrame(sched_items))
+        if len(sched_items) > SCHEDULE_TABLE_ROWS:
+            st.caption(f"Showing first {SCHEDULE_TABLE_ROWS} of {len(sched_items)} items.")
+        st.dataframe(_records_frame(sched_items[:SCHEDULE_TABLE_ROWS]))
     if st.session_state.last_whatif_kpis:
         render_kpis(st.session_state.last_whatif_kpis)
     with st.expander("Raw What-If Response & KPIs"):
@@ -236,9 +378,10 @@ else:
 
 st.markdown("---")
 st.header("Model Benchmark (Baseline vs MLP vs GNN)")
+
 # Initialize benchmark history in session state
 if "benchmark_history" not in st.session_state:
-    st.session_state.benchmark_history = []  # list of {ts, model_metrics: [{model,..}], config: {...}}
+    st.session_state.benchmark_history = deque(maxlen=HISTORY_MAX_ENTRIES)  # {ts, model_metrics: [{model,..}], config: {...}}
 with st.expander("Benchmark Panel", expanded=False):
     st.write("Runs /predict for each model kind and compares predicted delay minutes against proxy ground truth (current_delay_minutes field if present). This is a lightweight, same-state diagnostic, not a historical evaluation.")
     bench_cols = st.columns([1,1,1,1])
@@ -251,14 +394,15 @@ with st.expander("Benchmark Panel", expanded=False):
     include_mape = adv_cols[1].toggle("Include MAPE", value=False, key="bench_include_mape", help="Only for trains with current_delay_minutes > 0")
     show_ci = adv_cols[2].toggle("Show 95% CI", value=True, key="bench_show_ci", help="Approx normal CI on MAE using stderr = sigma/sqrt(n)")
     hist_cols = st.columns([1,1,2])
-    persist_file = hist_cols[0].text_input("Persist History File", value="benchmark_history.json", help="If provided, history will be appended (created if missing). Leave blank to keep in-memory only.")
+    persist_file = hist_cols[0].text_input("Persist History File", value="benchmark_history.jsonl", help="If provided, each run is appended as one JSON line (created if missing). Leave blank to keep in-memory only.")
     plot_history = hist_cols[1].toggle("Show History Plot", value=False, key="bench_plot_history")
     clear_hist = hist_cols[2].button("Clear History", key="bench_clear")
     if clear_hist:
-        st.session_state.benchmark_history = []
+        st.session_state.benchmark_history.clear()
+        _bump_history_rev()
         if persist_file:
             try:
-                open(persist_file, 'w').write('[]')
+                _replace_history_file(persist_file, b'')
             except Exception:
                 pass
         st.info("Benchmark history cleared.")
@@ -266,50 +410,51 @@ with st.expander("Benchmark Panel", expanded=False):
         try:
             models = ["baseline", "mlp", "gnn"] + (["auto"] if use_auto else [])
             results = []
-            import requests, statistics
-            truth_map = {}
-            # Build truth map (proxy) from trains
-            for tr in payload.get("trains", []):
-                tid = tr.get("id")
-                if isinstance(tid, str):
-                    truth_map[tid] = float(tr.get("current_delay_minutes", 0.0) or 0.0)
-            for mk in models:
+            # Truth map (proxy) and ids that actually carry current_delay_minutes
+            truth_map, tids, truth_vec, present_mask, _ = _index_trains()
+            bad = np.isnan(truth_vec)
+            if bad.any():
+                raise ValueError(f"Non-numeric current_delay_minutes for trains: {', '.join(tids[bad][:5])}")
+            # Skip missing when exclude_missing is True and truth is 0 and not actually present in payload
+            if exclude_missing:
+                sel_tids, sel_truth = tids[present_mask], truth_vec[present_mask]
+            else:
+                sel_tids, sel_truth = tids, truth_vec
+            considered = len(sel_tids)
+
+            # Encode the payload once; every model request sends the same bytes
+            body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+            headers = {"Content-Type": "application/json"}
+
+            def _predict(mk):
                 try:
-                    r = requests.post(f"{api.base_url}/predict", json=payload, params={"model": mk}, timeout=api.timeout)
+                    r = api.session.post(f"{api.base_url}/predict", data=body, params={"model": mk}, headers=headers, timeout=api.timeout)
                     r.raise_for_status()
-                    pj = r.json()
+                    return r.json()
                 except Exception as e:
-                    pj = {"error": str(e)}
+                    return {"error": str(e)}
+
+            # Model calls are independent I/O, so issue them concurrently
+            with ThreadPoolExecutor(max_workers=len(models)) as ex:
+                responses = dict(zip(models, ex.map(_predict, models)))
+            for mk in models:
+                pj = responses[mk]
                 preds = pj.get("predicted_delay_minutes", {}) if isinstance(pj, dict) else {}
-                abs_errors = []
-                sq_errors = []
-                signed_errors = []
-                mape_terms = []
-                considered = 0
-                for tid, tval in truth_map.items():
-                    # Skip missing when exclude_missing is True and truth is 0 and not actually present in payload
-                    present = any(isinstance(tr, dict) and tr.get("id") == tid and "current_delay_minutes" in tr for tr in payload.get("trains", []))
-                    if exclude_missing and not present:
-                        continue
-                    p = float(preds.get(tid, 0.0) or 0.0)
-                    err = p - tval
-                    signed_errors.append(err)
-                    abs_errors.append(abs(err))
-                    sq_errors.append(err * err)
-                    if include_mape and tval > 0:
-                        mape_terms.append(abs(err) / max(1e-9, tval))
-                    considered += 1
-                mae = statistics.fmean(abs_errors) if abs_errors else 0.0
-                rmse = (sum(sq_errors) / len(sq_errors)) ** 0.5 if sq_errors else 0.0
-                bias = statistics.fmean(signed_errors) if signed_errors else 0.0
-                max_err = max(abs_errors) if abs_errors else 0.0
-                mean_pred = statistics.fmean(preds.values()) if preds else 0.0
-                mape_val = (statistics.fmean(mape_terms) * 100.0) if mape_terms else 0.0
+                pred_arr = np.fromiter((preds.get(tid, 0.0) for tid in sel_tids), dtype=np.float64, count=considered)
+                # null predictions arrive as NaN; score them as 0.0
+                pred_arr[np.isnan(pred_arr)] = 0.0
+                err = pred_arr - sel_truth
+                abs_errors = np.abs(err)
+                mae = float(abs_errors.mean()) if considered else 0.0
+                rmse = float(np.sqrt(np.square(err).mean())) if considered else 0.0
+                bias = float(err.mean()) if considered else 0.0
+                max_err = float(abs_errors.max()) if considered else 0.0
+                mean_pred = float(pred_arr.mean()) if considered else 0.0
+                pos = sel_truth > 0
+                mape_val = float((abs_errors[pos] / sel_truth[pos]).mean() * 100.0) if include_mape and pos.any() else 0.0
                 # 95% CI for MAE (approx) -> std of abs errors / sqrt(n) * 1.96
-                if show_ci and len(abs_errors) > 1:
-                    mean_abs = mae
-                    var_abs = sum((e - mean_abs) ** 2 for e in abs_errors) / (len(abs_errors) - 1)
-                    se = (var_abs ** 0.5) / (len(abs_errors) ** 0.5)
+                if show_ci and considered > 1:
+                    se = float(abs_errors.std(ddof=1) / np.sqrt(considered))
                     ci_low = mae - 1.96 * se
                     ci_high = mae + 1.96 * se
                 else:
@@ -333,51 +478,35 @@ with st.expander("Benchmark Panel", expanded=False):
                 results.append(result_row)
             # sort
             results.sort(key=lambda d: d.get(sort_metric, 0.0))
-            import pandas as _pd
-            st.dataframe(_pd.DataFrame(results))
+            st.dataframe(pd.DataFrame(results))
             # Append to history
             ts = int(time.time())
             hist_entry = {"ts": ts, "metrics": results, "sort": sort_metric, "include_auto": use_auto, "n_trains": len(truth_map), "exclude_missing": exclude_missing, "include_mape": include_mape}
             st.session_state.benchmark_history.append(hist_entry)
+            _bump_history_rev()
             # Persist to file if requested
             if persist_file:
                 try:
-                    existing = []
-                    if os.path.exists(persist_file):
-                        with open(persist_file, 'r') as f:
-                            existing = _json.load(f) or []
-                    existing.append(hist_entry)
-                    with open(persist_file, 'w') as f:
-                        _json.dump(existing, f, indent=2)
+                    _append_history(persist_file, hist_entry)
                 except Exception as _e:
                     st.warning(f"Failed to persist history: {_e}")
             if show_raw:
                 st.subheader("Raw Prediction Payloads")
-                # Re-run quickly (avoid storing large objects long-term)
-                for mk in models:
-                    try:
-                        r = requests.post(f"{api.base_url}/predict", json=payload, params={"model": mk}, timeout=api.timeout)
-                        r.raise_for_status()
+                # Reuse the responses from the benchmark pass rather than re-posting
+                for mk, pj in responses.items():
+                    if "error" in pj:
+                        st.error(f"Predict {mk} failed: {pj['error']}")
+                    else:
                         st.caption(f"Model={mk}")
-                        st.json(r.json())
-                    except Exception as e:
-                        st.error(f"Predict {mk} failed: {e}")
+                        st.json(pj)
         except Exception as e:
             st.error(f"Benchmark failed: {e}")
     # History visualization
     if st.session_state.benchmark_history and plot_history:
-        import pandas as _pd
-        # Flatten per-model metrics for plotting
-        rows = []
-        for entry in st.session_state.benchmark_history:
-            for m in entry.get("metrics", []):
-                row = {"ts": entry.get("ts"), **m}
-                rows.append(row)
-        if rows:
-            dfh = _pd.DataFrame(rows)
+        dfh = _history_frame()
+        if not dfh.empty:
             try:
-                import plotly.express as _px
-                fig_hist = _px.line(dfh, x="ts", y="mae", color="model", markers=True, title="MAE Over Benchmark Runs")
+                fig_hist = px.line(dfh, x="ts", y="mae", color="model", markers=True, render_mode="webgl", title="MAE Over Benchmark Runs")
                 st.plotly_chart(fig_hist, use_container_width=True)
             except Exception as _e:
                 st.warning(f"Plot failed: {_e}")
@@ -390,55 +519,56 @@ name = st.text_input("New Scenario Name", value="scenario-1")
 if st.button("Save Scenario"):
     try:
         r = api.save_scenario(payload, name)
+        _list_scenarios.clear()
         st.success(f"Saved scenario with id={r.get('id')}")
     except Exception as e:
         st.error(f"Save failed: {e}")
 
-sc_list = api.get_scenarios().get("items", [])
+sc_list = _list_scenarios(api.base_url)
 sid_opts = ["-"] + [str(s.get("id")) for s in sc_list]
 sid_sel = st.selectbox("Select Scenario", options=sid_opts, index=0)
 
 if sid_sel != "-":
     sid = int(sid_sel)
-    runs = api.list_runs(sid).get("items", [])
-    st.dataframe(runs)
+    runs = _list_runs(api.base_url, sid)
+    st.dataframe(_records_frame(runs))
     if runs:
         rid = runs[0].get("id")
-        rd = api.get_run(rid).get("run", {})
+        rd = _get_run(api.base_url, rid)
         st.subheader("Latest Run (Full Details)")
         st.json(rd)
         c1, c2, c3, c4 = st.columns(4)
         if c1.button("Delete Scenario"):
             try:
                 d = api.delete_scenario(sid)
+                _list_scenarios.clear()
+                _list_runs.clear()
+                _get_run.clear()
                 st.success("Scenario deleted")
             except Exception as e:
                 st.error(f"Delete scenario failed: {e}")
         if c2.button("Delete Latest Run"):
             try:
                 d = api.delete_run(rid)
+                _list_runs.clear()
+                _get_run.clear()
                 st.success("Run deleted")
             except Exception as e:
                 st.error(f"Delete run failed: {e}")
         if c3.button("Download Schedule CSV"):
-            buf = io.StringIO()
-            writer = csv.DictWriter(buf, fieldnames=["train_id", "section_id", "entry", "exit"])
-            writer.writeheader()
-            for row in rd.get("schedule", []):
-                writer.writerow({
-                    "train_id": row.get("train_id"),
-                    "section_id": row.get("section_id"),
-                    "entry": row.get("entry"),
-                    "exit": row.get("exit"),
-                })
+            sched = rd.get("schedule", [])
+            # Write straight into a bytes buffer so download_button gets bytes without a str round-trip
+            buf = io.BytesIO()
+            pd.DataFrame(sched, columns=["train_id", "section_id", "entry", "exit"]).to_csv(buf, index=False)
             st.download_button("Download CSV", data=buf.getvalue(), file_name=f"scenario_{sid}_run_{rid}.csv", mime="text/csv")
         if c4.button("Download Lateness CSV"):
             # call backend CSV endpoint for accuracy
             try:
-                import requests
                 url = f"{api.base_url}/runs/{rid}/lateness.csv"
-                resp = requests.get(url, timeout=30)
-                resp.raise_for_status()
-                st.download_button("Download Lateness CSV", data=resp.text, file_name=f"scenario_{sid}_run_{rid}_lateness.csv", mime="text/csv")
+                # Pass the raw bytes through; no need to decode to str just to re-encode for the download
+                with api.session.get(url, timeout=30, stream=True) as resp:
+                    resp.raise_for_status()
+                    data = resp.content
+                st.download_button("Download Lateness CSV", data=data, file_name=f"scenario_{sid}_run_{rid}_lateness.csv", mime="text/csv")
             except Exception as e:
                 st.error(f"CSV download failed: {e}")
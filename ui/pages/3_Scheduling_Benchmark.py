@@ -1,5 +1,9 @@
+import numpy as np
+import pandas as pd
 import streamlit as st
-import os, sys, random, time, statistics, json
+import os, sys, statistics, json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import List
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
@@ -13,7 +17,7 @@ st.caption("In-process benchmark of the greedy (or MILP) scheduler over syntheti
 
 try:
     from src.core.models import Section, TrainRequest, NetworkModel  # type: ignore
-    from src.core.solver import schedule_trains  # type: ignore
+    from src.core.solver import time_schedule  # type: ignore
 except Exception as e:  # pragma: no cover
     st.error(f"Failed to import scheduling core: {e}")
     st.stop()
@@ -29,79 +33,114 @@ with st.expander("Benchmark Configuration", expanded=True):
     route_len = c6.number_input("Avg Route Len", min_value=1, max_value=500, value=6, step=1)
     solver = c7.selectbox("Solver", options=["greedy", "milp"], index=0)
     seed = c8.number_input("Seed", min_value=0, max_value=999999, value=42, step=1)
-    emit_json = st.toggle("Emit JSON Rows", value=False, help="Show each run row as JSON (can copy to file)")
+    emit_json = st.toggle("Emit JSON Rows", value=False, help="Show all run rows as one JSON block (can copy to file)")
+    parallel = st.toggle(
+        "Parallel Runs (throughput mode)", value=False,
+        help="Greedy only: solve instances concurrently across processes. Finishes sooner, but each elapsed time is "
+             "measured under CPU contention, so per-run times are not comparable with serial or MILP runs.",
+    )
     run_btn = st.button("Run Benchmark", type="primary")
 
-def build_random_network(num_sections: int) -> NetworkModel:
-    secs: List[Section] = []
-    for i in range(num_sections):
-        secs.append(Section(id=f"S{i+1}", headway_seconds=random.randint(60,180), traverse_seconds=random.randint(80,200)))
+def build_random_network(num_sections: int, rng: np.random.Generator) -> NetworkModel:
+    heads = rng.integers(60, 181, num_sections).tolist()
+    travs = rng.integers(80, 201, num_sections).tolist()
+    secs: List[Section] = [
+        Section(id=f"S{i+1}", headway_seconds=h, traverse_seconds=tr)
+        for i, (h, tr) in enumerate(zip(heads, travs))
+    ]
     return NetworkModel(sections=secs)
 
-def build_random_trains(n: int, net: NetworkModel, avg_len: int) -> List[TrainRequest]:
-    trains: List[TrainRequest] = []
-    sec_ids = [s.id for s in net.sections]
-    for i in range(n):
-        dep = random.randint(0, 600)
-        if avg_len >= len(sec_ids):
-            route = sec_ids[:]
-        else:
-            length = max(1, min(len(sec_ids), int(random.gauss(avg_len, 1))))
-            start = random.randint(0, max(0, len(sec_ids) - length))
-            route = sec_ids[start:start+length]
-        trains.append(TrainRequest(id=f"T{i+1}", priority=random.randint(1,3), route_sections=route, planned_departure=dep))
-    return trains
+def build_random_trains(n: int, sec_ids: List[str], avg_len: int, rng: np.random.Generator) -> List[TrainRequest]:
+    # Draw every random field for the batch up front, then materialize the dataclasses in one pass
+    n_sec = len(sec_ids)
+    deps = rng.integers(0, 601, n).tolist()
+    prios = rng.integers(1, 4, n).tolist()
+    if avg_len >= n_sec:
+        # Every train covers the whole line; share one route list (the scheduler only reads routes)
+        routes = [sec_ids] * n
+    else:
+        lens = np.clip(rng.normal(avg_len, 1, n).astype(int), 1, n_sec)
+        starts = rng.integers(0, n_sec - lens + 1)
+        routes = [sec_ids[s:s+l] for s, l in zip(starts.tolist(), lens.tolist())]
+    return [
+        TrainRequest(id=f"T{i+1}", priority=prio, route_sections=route, planned_departure=dep)
+        for i, (dep, prio, route) in enumerate(zip(deps, prios, routes))
+    ]
 
-def run_once(n_tr: int, net: NetworkModel, avg_len: int, solver: str):
-    trains = build_random_trains(n_tr, net, avg_len)
-    t0 = time.perf_counter()
-    sched = schedule_trains(trains, net, solver=solver)
-    dt = time.perf_counter() - t0
-    horizon = max((it.exit for it in sched), default=0)
+def _row(n_tr: int, trains: List[TrainRequest], timing: dict) -> dict:
     return {
         "n_trains": n_tr,
-        "elapsed_s": dt,
-        "items": len(sched),
-        "horizon": horizon,
+        "elapsed_s": timing["elapsed_s"],
+        "items": timing["items"],
+        "horizon": timing["horizon_s"],
         "mean_route": statistics.fmean(len(t.route_sections) for t in trains) if trains else 0.0,
     }
 
+def run_once(n_tr: int, net: NetworkModel, sec_ids: List[str], avg_len: int, solver: str, rng: np.random.Generator):
+    trains = build_random_trains(n_tr, sec_ids, avg_len, rng)
+    return _row(n_tr, trains, time_schedule(trains, net, solver))
+
 if run_btn:
     if max_tr < min_tr:
         st.error("Max Trains must be >= Min Trains")
     else:
-        random.seed(int(seed))
-        net = build_random_network(int(n_sections))
-        rows = []
+        # One seeded generator drives both the network and every train instance
+        rng = np.random.default_rng(int(seed))
+        net = build_random_network(int(n_sections), rng)
+        sec_ids = [sec.id for sec in net.sections]
         prog = st.progress(0.0, text="Running benchmark...")
-        total_iters = ((int(max_tr) - int(min_tr)) // int(step_tr) + 1) * int(repeats)
+        sizes = [n for n in range(int(min_tr), int(max_tr) + 1, int(step_tr)) for _ in range(int(repeats))]
+        total_iters = len(sizes)
+        # Redraw the progress bar ~50 times per run rather than once per instance
+        prog_every = max(1, total_iters // 50)
         done = 0
-        for n in range(int(min_tr), int(max_tr) + 1, int(step_tr)):
-            for _ in range(int(repeats)):
-                r = run_once(n, net, int(route_len), solver)
-                rows.append(r)
+        if parallel and solver == "greedy":
+            # Greedy is pure-Python and CPU-bound: build instances here (keeps the seeded sequence) and
+            # solve them across processes. Rows keep submission order regardless of completion order.
+            # spawn, not the Linux default fork: forking from a thread of the Streamlit server can deadlock.
+            rows = [None] * total_iters
+            with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn")) as pool:
+                futs = {}
+                for i, n in enumerate(sizes):
+                    trains = build_random_trains(n, sec_ids, int(route_len), rng)
+                    futs[pool.submit(time_schedule, trains, net, solver)] = (i, n, trains)
+                for fut in as_completed(futs):
+                    i, n, trains = futs[fut]
+                    rows[i] = _row(n, trains, fut.result())
+                    done += 1
+                    if done % prog_every == 0:
+                        prog.progress(done / total_iters, text=f"{done}/{total_iters} runs")
+        else:
+            # Serial by default so elapsed times are uncontended; MILP always runs here since its
+            # backend may already use multiple threads
+            rows = []
+            for n in sizes:
+                rows.append(run_once(n, net, sec_ids, int(route_len), solver, rng))
                 done += 1
-                prog.progress(done / total_iters, text=f"{done}/{total_iters} runs")
-                if emit_json:
-                    st.code(json.dumps(r), language="json")
+                if done % prog_every == 0:
+                    prog.progress(done / total_iters, text=f"{done}/{total_iters} runs")
         prog.empty()
-        # Aggregate summary
-        from collections import defaultdict
-        bucket = defaultdict(list)
-        for r in rows:
-            bucket[r['n_trains']].append(r['elapsed_s'])
-        summary = []
-        for n in sorted(bucket):
-            summary.append({"n_trains": n, "mean_ms": statistics.fmean(bucket[n]) * 1000, "runs": len(bucket[n])})
+        if parallel and solver == "greedy":
+            st.caption(f"Throughput mode: runs were solved {os.cpu_count()} at a time, so elapsed times include CPU contention and are not comparable with serial runs.")
+        if emit_json:
+            st.code(json.dumps(rows, indent=2), language="json")
         try:
-            import pandas as _pd
+            df_rows = pd.DataFrame(rows)
+            # Aggregate summary: mean time and run count per train count in one groupby
+            summary_df = (
+                df_rows.groupby("n_trains", sort=True)["elapsed_s"]
+                .agg(mean_ms="mean", runs="count")
+                .reset_index()
+            )
+            summary_df["mean_ms"] *= 1000
+            summary = summary_df.to_dict("records")
             st.subheader("Run Rows")
-            st.dataframe(_pd.DataFrame(rows))
+            st.dataframe(df_rows)
             st.subheader("Summary")
-            st.dataframe(_pd.DataFrame(summary))
+            st.dataframe(summary_df)
             # Plot
             import plotly.express as px
-            fig = px.line(_pd.DataFrame(summary), x="n_trains", y="mean_ms", markers=True, title="Mean Scheduling Time (ms) vs Trains")
+            fig = px.line(summary_df, x="n_trains", y="mean_ms", markers=True, title="Mean Scheduling Time (ms) vs Trains")
             st.plotly_chart(fig, use_container_width=True)
             # Download buttons
             st.download_button("Download Rows JSON", data=json.dumps(rows, indent=2), file_name="benchmark_rows.json", mime="application/json")
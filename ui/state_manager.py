@@ -3,21 +3,27 @@ import os, sys
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
-from typing import Any, Dict
+from collections import defaultdict
+from typing import Any, Dict, List
 import streamlit as st
 
 
+# Session keys and zero-arg factories for their initial values. Factories rather than values so each
+# session gets its own lists and default_payload() is only built when the key is actually missing.
+_DEFAULTS = {
+    "solver": lambda: "greedy",
+    "otp_tolerance": lambda: 0,
+    "state_payload": lambda: default_payload(),
+    "pending_holds": list,  # list of {train_id, add_seconds}
+    "action_log": list,  # list of strings
+}
+
+
 def ensure_defaults() -> None:
-    if "solver" not in st.session_state:
-        st.session_state.solver = "greedy"
-    if "otp_tolerance" not in st.session_state:
-        st.session_state.otp_tolerance = 0
-    if "state_payload" not in st.session_state:
-        st.session_state.state_payload = default_payload()
-    if "pending_holds" not in st.session_state:
-        st.session_state.pending_holds = []  # list of {train_id, add_seconds}
-    if "action_log" not in st.session_state:
-        st.session_state.action_log = []  # list of strings
+    state = st.session_state
+    for key, factory in _DEFAULTS.items():
+        if key not in state:
+            state[key] = factory()
 
 
 def default_payload() -> Dict[str, Any]:
@@ -35,12 +41,40 @@ def default_payload() -> Dict[str, Any]:
 
 
 def get_state_payload() -> Dict[str, Any]:
-    return st.session_state.get("state_payload", default_payload())
+    # Default payload is built only when nothing has been stored yet
+    if "state_payload" in st.session_state:
+        return st.session_state.state_payload
+    return default_payload()
 
 
 def set_state_payload(p: Dict[str, Any]) -> None:
+    # Bump the version only on real changes; the editor re-parses an equal dict on every rerun
+    prev = st.session_state.get("state_payload")
+    if prev is not p and prev != p:
+        _bump_payload_version()
     st.session_state.state_payload = p
 
+
+def _bump_payload_version() -> None:
+    st.session_state.payload_version = st.session_state.get("payload_version", 0) + 1
+
+
+def get_payload_key() -> int:
+    """Version of the current state payload, bumped on every real change.
+    Session-scoped: compare against keys held in st.session_state to know when derived data is stale.
+    """
+    return st.session_state.get("payload_version", 0)
+
+def get_sanitized_trains() -> List[Dict[str, Any]]:
+    """Dict-only trains of the current payload. Rebuilt once per payload version so callers can skip type checks."""
+    key = get_payload_key()
+    if st.session_state.get("trains_valid_key") != key:
+        payload = get_state_payload()
+        trains = payload.get("trains", []) if isinstance(payload, dict) else []
+        st.session_state.trains_valid = [tr for tr in trains if isinstance(tr, dict)]
+        st.session_state.trains_valid_key = key
+    return st.session_state.trains_valid
+
 def add_hold_action(train_id: str, add_seconds: int) -> None:
     st.session_state.pending_holds.append({"train_id": train_id, "add_seconds": int(add_seconds)})
     st.session_state.action_log.append(f"Queued hold {add_seconds}s for {train_id}")
@@ -52,12 +86,21 @@ def clear_pending_holds() -> None:
 def apply_holds_to_state() -> None:
     payload = get_state_payload()
     by_id = {t.get("id"): t for t in payload.get("trains", [])}
+    # Sum holds per train first so each train is written once and the log is extended once
+    increments: Dict[str, int] = defaultdict(int)
+    logs: List[str] = []
     for h in st.session_state.pending_holds:
         tid = h.get("train_id")
         inc = int(h.get("add_seconds") or 0)
         if tid in by_id:
-            base = int(by_id[tid].get("planned_departure", 0) or 0)
-            by_id[tid]["planned_departure"] = base + inc
-            st.session_state.action_log.append(f"Applied hold {inc}s to {tid}")
+            increments[tid] += inc
+            logs.append(f"Applied hold {inc}s to {tid}")
+    for tid, inc in increments.items():
+        tr = by_id[tid]
+        tr["planned_departure"] = int(tr.get("planned_departure", 0) or 0) + inc
+    st.session_state.action_log.extend(logs)
+    if increments:
+        # Trains were edited in place, which set_state_payload can't see as a change
+        _bump_payload_version()
     set_state_payload(payload)
     clear_pending_holds()